@@ -3,5 +3,5 @@ Core package for the Telegram flower shop bot.
 This module exposes helper imports for easier access.
 """
 
-from .config import Settings  # noqa: F401
+from .config import Settings, get_settings  # noqa: F401
 
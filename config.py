@@ -7,7 +7,8 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
-from typing import List
+from functools import lru_cache
+from typing import FrozenSet
 
 from dotenv import load_dotenv
 
@@ -15,25 +16,50 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-@dataclass
+@dataclass(frozen=True)
 class Settings:
     """Bot configuration loaded from environment variables."""
 
     bot_token: str = field(default_factory=lambda: os.getenv("BOT_TOKEN", ""))
-    admin_ids: List[int] = field(
-        default_factory=lambda: [
+    admin_ids: FrozenSet[int] = field(
+        default_factory=lambda: frozenset(
             int(admin.strip()) for admin in os.getenv("ADMIN_IDS", "").split(",") if admin.strip()
-        ]
+        )
     )
     db_path: str = field(default_factory=lambda: os.getenv("DB_PATH", "flower_bot/data/bot.db"))
+    db_pool_size: int = field(default_factory=lambda: int(os.getenv("DB_POOL_SIZE", "4")))
+    # FSM storage; without it states live in process memory and are lost on restart.
+    redis_url: str | None = field(default_factory=lambda: os.getenv("REDIS_URL") or None)
+    # Webhook mode is used when WEBHOOK_URL (public https base URL) is set; otherwise long polling.
+    webhook_url: str | None = field(default_factory=lambda: os.getenv("WEBHOOK_URL") or None)
+    webhook_path: str = field(default_factory=lambda: os.getenv("WEBHOOK_PATH", "/webhook"))
+    # Checked against X-Telegram-Bot-Api-Secret-Token; required in webhook mode and shared by all workers.
+    webhook_secret: str | None = field(default_factory=lambda: os.getenv("WEBHOOK_SECRET") or None)
+    webapp_host: str = field(default_factory=lambda: os.getenv("WEBAPP_HOST", "0.0.0.0"))
+    webapp_port: int = field(default_factory=lambda: int(os.getenv("PORT", "8080")))
     admin_chat_id: int | None = field(
         default=None if not os.getenv("ADMIN_CHAT_ID") else int(os.getenv("ADMIN_CHAT_ID"))
     )
     prepayment_ratio: float = 0.5
     timezone: str = os.getenv("TIMEZONE", "Asia/Ho_Chi_Minh")
 
+    def __post_init__(self) -> None:
+        # Explicitly passed ids may be a list; keep membership checks O(1).
+        if not isinstance(self.admin_ids, frozenset):
+            object.__setattr__(self, "admin_ids", frozenset(self.admin_ids))
+
     def validate(self) -> None:
         if not self.bot_token:
             raise RuntimeError("BOT_TOKEN is required in environment variables")
+        if self.db_pool_size < 1:
+            raise RuntimeError("DB_POOL_SIZE must be a positive integer")
+        if self.webhook_url and not self.webhook_secret:
+            raise RuntimeError("WEBHOOK_SECRET is required when WEBHOOK_URL is set")
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading the environment only once."""
+    settings = Settings()
+    settings.validate()
+    return settings
@@ -6,40 +6,344 @@ Uses SQLite for local development; can be swapped to asyncpg with the same inter
 from __future__ import annotations
 
 import asyncio
+import logging
+import sqlite3
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import aiosqlite
 
-from .models import Category, Product, Order, SupportMessage
+from .models import Category, Product, ProductCard, Order, SupportMessage, PendingNotification
+
+
+# Connection tuning: WAL + synchronous=NORMAL avoids an fsync on every commit.
+_PRAGMAS = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+PRAGMA foreign_keys = ON;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -64000;
+PRAGMA mmap_size = 268435456;
+PRAGMA busy_timeout = 5000;
+PRAGMA wal_autocheckpoint = 1000;
+"""
+
+_CACHED_STATEMENTS = 256
+
+logger = logging.getLogger(__name__)
+
+# The writer runs in autocommit mode (isolation_level=None); transactions are explicit.
+# IMMEDIATE takes the write lock up front instead of upgrading mid-transaction.
+_SQL_BEGIN = "BEGIN IMMEDIATE"
+_SQL_COMMIT = "COMMIT"
+_SQL_ROLLBACK = "ROLLBACK"
+
+# TIMESTAMP and BOOLEAN columns come back as datetime/bool straight from the driver,
+# so rows can be unpacked into the dataclasses by column name.
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("BOOLEAN", lambda value: value != b"0")
+
+# SQL is kept in module-level constants so every call passes the same string
+# and hits the per-connection prepared statement cache.
+_SQL_INSERT_CATEGORY = "INSERT OR IGNORE INTO categories (name) VALUES (?)"
+_SQL_RENAME_CATEGORY = "UPDATE categories SET name = ? WHERE id = ?"
+_SQL_DELETE_CATEGORY = "DELETE FROM categories WHERE id = ?"
+_SQL_GET_CATEGORIES = "SELECT id, name, created_at FROM categories ORDER BY id ASC"
+
+_SQL_INSERT_PRODUCT = """
+INSERT INTO products (category_id, name, price, price_from, description, photo_file_id, is_active)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_DELETE_PRODUCT = "DELETE FROM products WHERE id = ?"
+
+_SQL_GET_PRODUCTS_BY_CATEGORY = """
+SELECT id, category_id, name, price, price_from, description, photo_file_id, is_active, created_at
+FROM products
+WHERE category_id = ? AND is_active = 1
+ORDER BY created_at DESC
+LIMIT ? OFFSET ?
+"""
+
+_SQL_GET_PRODUCT_CARDS_PAGE = """
+SELECT id, name, price, price_from, description, photo_file_id, COUNT(*) OVER () AS total
+FROM products
+WHERE category_id = ? AND is_active = 1
+ORDER BY created_at DESC
+LIMIT ? OFFSET ?
+"""
+
+_SQL_COUNT_PRODUCTS_IN_CATEGORY = "SELECT COUNT(*) FROM products WHERE category_id = ? AND is_active = 1"
+
+_SQL_GET_PRODUCT = """
+SELECT id, category_id, name, price, price_from, description, photo_file_id, is_active, created_at
+FROM products WHERE id = ?
+"""
+
+_SQL_GET_PRODUCT_NAME = "SELECT name FROM products WHERE id = ?"
+_SQL_GET_PRODUCT_NAMES_BY_IDS = "SELECT id, name FROM products WHERE id IN ({placeholders})"
+
+_SQL_INSERT_ORDER = """
+INSERT INTO orders (user_id, username, product_id, price, delivery_date, delivery_time, address, card_text, phone, status)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPDATE_ORDER_STATUS = "UPDATE orders SET status = ? WHERE id = ?"
+_SQL_UPDATE_ORDER_STATUS_RETURNING_USER = "UPDATE orders SET status = ? WHERE id = ? RETURNING user_id"
+
+_SQL_GET_USER_ORDERS = """
+SELECT id, user_id, username, product_id, price, delivery_date, delivery_time, address, card_text, phone, status, created_at
+FROM orders WHERE user_id = ?
+ORDER BY created_at DESC LIMIT ?
+"""
+
+_SQL_GET_LAST_COMPLETED_ORDERS = """
+SELECT id, user_id, username, product_id, price, delivery_date, delivery_time, address, card_text, phone, status, created_at
+FROM orders
+WHERE user_id = ? AND status = '🟢 Завершён'
+ORDER BY created_at DESC LIMIT ?
+"""
+
+_SQL_GET_ORDER = """
+SELECT id, user_id, username, product_id, price, delivery_date, delivery_time, address, card_text, phone, status, created_at
+FROM orders WHERE id = ?
+"""
+
+_SQL_INSERT_SUPPORT_MESSAGE = "INSERT INTO support_messages (user_id, username, text) VALUES (?, ?, ?)"
+
+_SQL_INSERT_PENDING_NOTIFICATION = "INSERT INTO pending_notifications (chat_id, text, reply_markup) VALUES (?, ?, ?)"
+_SQL_GET_PENDING_NOTIFICATIONS = """
+SELECT id, chat_id, text, reply_markup, attempts, created_at
+FROM pending_notifications ORDER BY id LIMIT ?
+"""
+_SQL_BUMP_NOTIFICATION_ATTEMPTS = "UPDATE pending_notifications SET attempts = attempts + 1 WHERE id = ?"
+_SQL_DELETE_PENDING_NOTIFICATION = "DELETE FROM pending_notifications WHERE id = ?"
+
+
+@lru_cache(maxsize=64)
+def _update_product_sql(columns: Tuple[str, ...]) -> str:
+    """Build the UPDATE once per column set, so repeated edits reuse one string and one cached statement."""
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    return f"UPDATE products SET {assignments} WHERE id = ?"
+
+
+@lru_cache(maxsize=64)
+def _in_list_sql(template: str, count: int) -> str:
+    return template.format(placeholders=", ".join("?" * count))
+
+
+# (sql, params, returns_row, future); ``returns_row`` statements resolve to their RETURNING row.
+_PendingWrite = Tuple[str, Sequence[Any], bool, "asyncio.Future[Any]"]
+
+
+class WriteBatcher:
+    """Coalesces concurrent writes into a single transaction (group commit).
+
+    Statements submitted within ``window`` seconds of each other are executed on
+    the writer connection and committed together, so a burst of writes pays for
+    one fsync instead of one per statement. Each batch runs under ``lock``;
+    ``Database.writer`` takes the same lock for its own transactions.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection, window: float = 0.01, max_batch: int = 128) -> None:
+        self._conn = conn
+        self._window = window
+        self._max_batch = max_batch
+        self._queue: asyncio.Queue[Optional[_PendingWrite]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task[None]] = None
+        self.lock = asyncio.Lock()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush pending writes and stop the background task."""
+        if self._task:
+            self._queue.put_nowait(None)
+            await self._task
+            self._task = None
+
+    async def submit(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Queue a statement and wait for its commit. Returns ``lastrowid``."""
+        return await self._enqueue(sql, params, False)
+
+    async def submit_returning(self, sql: str, params: Sequence[Any] = ()) -> Optional[aiosqlite.Row]:
+        """Queue a ``... RETURNING`` statement and wait for its commit. Returns the first row, if any."""
+        return await self._enqueue(sql, params, True)
+
+    async def _enqueue(self, sql: str, params: Sequence[Any], returns_row: bool) -> Any:
+        # Nothing would ever resolve the future without the background task.
+        if self._task is None or self._task.done():
+            raise RuntimeError("WriteBatcher is not running")
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((sql, params, returns_row, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            await asyncio.sleep(self._window)
+            batch = [item]
+            stopping = False
+            while len(batch) < self._max_batch and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                async with self.lock:
+                    await self._flush(batch)
+            except Exception as exc:
+                # e.g. the ROLLBACK itself failed; fail this batch but keep serving later writes.
+                logger.exception("Write batch failed")
+                for _, _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[_PendingWrite]) -> None:
+        results: List[Tuple["asyncio.Future[Any]", object]] = []
+        try:
+            await self._conn.execute(_SQL_BEGIN)
+            for sql, params, returns_row, future in batch:
+                try:
+                    cursor = await self._conn.execute(sql, params)
+                    if returns_row:
+                        # RETURNING rows must be drained before COMMIT can run.
+                        rows = await cursor.fetchall()
+                        result = rows[0] if rows else None
+                    else:
+                        result = cursor.lastrowid
+                except sqlite3.Error as exc:
+                    if not self._conn.in_transaction:
+                        # SQLITE_FULL, SQLITE_IOERR, ... roll back the whole transaction, so the
+                        # statements before this one are lost too: fail the batch as a whole.
+                        raise
+                    # Only this statement is rolled back; the rest of the batch still commits.
+                    results.append((future, exc))
+                else:
+                    results.append((future, result))
+            await self._conn.execute(_SQL_COMMIT)
+        except Exception as exc:
+            if self._conn.in_transaction:
+                await self._conn.execute(_SQL_ROLLBACK)
+            results = [(future, exc) for _, _, _, future in batch]
+
+        for future, result in results:
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
 
 
 class Database:
-    """Lightweight async wrapper around aiosqlite."""
+    """Lightweight async wrapper around aiosqlite.
 
-    def __init__(self, db_path: str) -> None:
+    Writes go through a single writer connection and are group-committed by a
+    ``WriteBatcher``, while reads are served by a small pool of read-only
+    connections so they never queue behind a write (WAL allows concurrent readers).
+    """
+
+    def __init__(self, db_path: str, pool_size: int = 4, categories_ttl: float = 300.0) -> None:
         self.db_path = Path(db_path)
-        self._conn: Optional[aiosqlite.Connection] = None
-        self._lock = asyncio.Lock()
+        self.pool_size = pool_size
+        self.categories_ttl = categories_ttl
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._batcher: Optional[WriteBatcher] = None
+        # Categories change rarely: keep them (and an id -> name map) in memory.
+        # Mutators bump the epoch so an in-flight read cannot store a stale result.
+        self._categories_cache: Optional[Tuple[List[Category], Dict[int, str]]] = None
+        self._categories_cached_at = 0.0
+        self._categories_epoch = 0
+        # Bumped on every product or category change; callers key catalog caches on it.
+        self._products_epoch = 0
+
+    @property
+    def products_epoch(self) -> int:
+        return self._products_epoch
 
     async def connect(self) -> None:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = await aiosqlite.connect(self.db_path.as_posix())
-        await self._conn.execute("PRAGMA foreign_keys = ON;")
-        await self._conn.execute("PRAGMA journal_mode = WAL;")
+        self._writer = await aiosqlite.connect(
+            self.db_path.as_posix(),
+            cached_statements=_CACHED_STATEMENTS,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None,
+        )
+        self._writer.row_factory = aiosqlite.Row
+        await self._writer.executescript(_PRAGMAS)
+        # journal_mode silently stays unchanged where WAL is unsupported (e.g. some network filesystems).
+        cursor = await self._writer.execute("PRAGMA journal_mode")
+        (journal_mode,) = await cursor.fetchone()
+        if journal_mode.lower() != "wal":
+            logger.warning("SQLite is running in %s journal mode instead of WAL; writes will block readers", journal_mode)
+        for _ in range(self.pool_size):
+            reader = await aiosqlite.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                cached_statements=_CACHED_STATEMENTS,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+            )
+            reader.row_factory = aiosqlite.Row
+            await reader.executescript(_PRAGMAS)
+            self._readers.put_nowait(reader)
+        self._batcher = WriteBatcher(self._writer)
+        self._batcher.start()
 
     async def close(self) -> None:
-        if self._conn:
-            await self._conn.close()
-            self._conn = None
+        if self._batcher:
+            await self._batcher.stop()
+            self._batcher = None
+        while not self._readers.empty():
+            await self._readers.get_nowait().close()
+        if self._writer:
+            await self._writer.close()
+            self._writer = None
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection from the pool."""
+        reader = await self._readers.get()
+        try:
+            yield reader
+        finally:
+            self._readers.put_nowait(reader)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run a multi-statement write transaction on the writer connection.
+
+        Commits on success and rolls back on error. Single statements should use the
+        batcher-backed methods instead; this holds the writer for the whole block.
+        """
+        if not self._writer or not self._batcher:
+            raise RuntimeError("Database connection is not initialized")
+        async with self._batcher.lock:
+            await self._writer.execute(_SQL_BEGIN)
+            try:
+                yield self._writer
+            except BaseException:
+                await self._writer.execute(_SQL_ROLLBACK)
+                raise
+            await self._writer.execute(_SQL_COMMIT)
 
     async def create_schema(self) -> None:
         """Create tables if they do not exist."""
-        if not self._conn:
+        if not self._writer:
             raise RuntimeError("Database connection is not initialized")
 
-        await self._conn.executescript(
+        await self._writer.executescript(
             """
             CREATE TABLE IF NOT EXISTS categories (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -81,9 +385,24 @@ class Database:
                 text TEXT NOT NULL,
                 created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
             );
+
+            CREATE TABLE IF NOT EXISTS pending_notifications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                reply_markup TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_products_cat_active_created
+                ON products (category_id, is_active, created_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_orders_user_created
+                ON orders (user_id, created_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_orders_user_status_created
+                ON orders (user_id, status, created_at DESC);
             """
         )
-        await self._conn.commit()
 
         # Seed default categories if empty
         if not await self.get_categories():
@@ -95,29 +414,56 @@ class Database:
                 "🌿 Мини",
                 "🌈 Индивидуальный заказ",
             ]
-            for name in defaults:
-                await self.add_category(name)
+            async with self.writer() as conn:
+                await conn.executemany(_SQL_INSERT_CATEGORY, [(name,) for name in defaults])
+            self._invalidate_categories()
+
+    def _invalidate_categories(self) -> None:
+        self._categories_cache = None
+        self._categories_epoch += 1
+        # Category names are shown in product listings, and deletes cascade to products.
+        self._products_epoch += 1
+
+    async def _load_categories(self) -> Tuple[List[Category], Dict[int, str]]:
+        cached = self._categories_cache
+        if cached is not None and time.monotonic() - self._categories_cached_at < self.categories_ttl:
+            return cached
+        epoch = self._categories_epoch
+        async with self.reader() as conn:
+            cursor = await conn.execute(_SQL_GET_CATEGORIES)
+            rows = await cursor.fetchall()
+        categories = [Category(**dict(row)) for row in rows]
+        loaded = (categories, {category.id: category.name for category in categories})
+        if epoch == self._categories_epoch:
+            self._categories_cache = loaded
+            self._categories_cached_at = time.monotonic()
+        return loaded
 
     async def add_category(self, name: str) -> int:
-        async with self._lock:
-            cursor = await self._conn.execute("INSERT OR IGNORE INTO categories (name) VALUES (?)", (name,))
-            await self._conn.commit()
-            return cursor.lastrowid
+        try:
+            return await self._batcher.submit(_SQL_INSERT_CATEGORY, (name,))
+        finally:
+            self._invalidate_categories()
 
     async def rename_category(self, category_id: int, new_name: str) -> None:
-        async with self._lock:
-            await self._conn.execute("UPDATE categories SET name = ? WHERE id = ?", (new_name, category_id))
-            await self._conn.commit()
+        try:
+            await self._batcher.submit(_SQL_RENAME_CATEGORY, (new_name, category_id))
+        finally:
+            self._invalidate_categories()
 
     async def delete_category(self, category_id: int) -> None:
-        async with self._lock:
-            await self._conn.execute("DELETE FROM categories WHERE id = ?", (category_id,))
-            await self._conn.commit()
+        try:
+            await self._batcher.submit(_SQL_DELETE_CATEGORY, (category_id,))
+        finally:
+            self._invalidate_categories()
 
     async def get_categories(self) -> List[Category]:
-        cursor = await self._conn.execute("SELECT id, name, created_at FROM categories ORDER BY id ASC")
-        rows = await cursor.fetchall()
-        return [Category(id=row[0], name=row[1], created_at=datetime.fromisoformat(row[2])) for row in rows]
+        categories, _ = await self._load_categories()
+        return categories
+
+    async def get_category_name(self, category_id: int) -> Optional[str]:
+        _, names = await self._load_categories()
+        return names.get(category_id)
 
     async def add_product(
         self,
@@ -129,90 +475,76 @@ class Database:
         photo_file_id: str,
         is_active: bool = True,
     ) -> int:
-        async with self._lock:
-            cursor = await self._conn.execute(
-                """
-                INSERT INTO products (category_id, name, price, price_from, description, photo_file_id, is_active)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
+        try:
+            return await self._batcher.submit(
+                _SQL_INSERT_PRODUCT,
                 (category_id, name, price, int(price_from), description, photo_file_id, int(is_active)),
             )
-            await self._conn.commit()
-            return cursor.lastrowid
+        finally:
+            self._products_epoch += 1
 
     async def update_product(self, product_id: int, **fields: object) -> None:
         if not fields:
             return
-        columns = ", ".join(f"{key} = ?" for key in fields)
         values: List[object] = list(fields.values())
         values.append(product_id)
-        async with self._lock:
-            await self._conn.execute(f"UPDATE products SET {columns} WHERE id = ?", values)
-            await self._conn.commit()
+        try:
+            await self._batcher.submit(_update_product_sql(tuple(fields)), values)
+        finally:
+            self._products_epoch += 1
 
     async def delete_product(self, product_id: int) -> None:
-        async with self._lock:
-            await self._conn.execute("DELETE FROM products WHERE id = ?", (product_id,))
-            await self._conn.commit()
+        try:
+            await self._batcher.submit(_SQL_DELETE_PRODUCT, (product_id,))
+        finally:
+            self._products_epoch += 1
 
     async def get_products_by_category(
         self, category_id: int, limit: int, offset: int = 0
     ) -> List[Product]:
-        cursor = await self._conn.execute(
-            """
-            SELECT id, category_id, name, price, price_from, description, photo_file_id, is_active, created_at
-            FROM products
-            WHERE category_id = ? AND is_active = 1
-            ORDER BY created_at DESC
-            LIMIT ? OFFSET ?
-            """,
-            (category_id, limit, offset),
-        )
-        rows = await cursor.fetchall()
-        return [
-            Product(
-                id=row[0],
-                category_id=row[1],
-                name=row[2],
-                price=row[3],
-                price_from=bool(row[4]),
-                description=row[5],
-                photo_file_id=row[6],
-                is_active=bool(row[7]),
-                created_at=datetime.fromisoformat(row[8]),
-            )
-            for row in rows
-        ]
+        async with self.reader() as conn:
+            cursor = await conn.execute(_SQL_GET_PRODUCTS_BY_CATEGORY, (category_id, limit, offset))
+            rows = await cursor.fetchall()
+        return [Product(**dict(row)) for row in rows]
+
+    async def get_products_page_cards(
+        self, category_id: int, limit: int, offset: int = 0
+    ) -> Tuple[List[ProductCard], int]:
+        """Return one page of catalog cards (only the displayed columns) and the category total."""
+        async with self.reader() as conn:
+            cursor = await conn.execute(_SQL_GET_PRODUCT_CARDS_PAGE, (category_id, limit, offset))
+            rows = await cursor.fetchall()
+        return [ProductCard(*row[:6]) for row in rows], (rows[0]["total"] if rows else 0)
 
     async def count_products_in_category(self, category_id: int) -> int:
-        cursor = await self._conn.execute(
-            "SELECT COUNT(*) FROM products WHERE category_id = ? AND is_active = 1", (category_id,)
-        )
-        row = await cursor.fetchone()
+        async with self.reader() as conn:
+            cursor = await conn.execute(_SQL_COUNT_PRODUCTS_IN_CATEGORY, (category_id,))
+            row = await cursor.fetchone()
         return int(row[0]) if row else 0
 
     async def get_product(self, product_id: int) -> Optional[Product]:
-        cursor = await self._conn.execute(
-            """
-            SELECT id, category_id, name, price, price_from, description, photo_file_id, is_active, created_at
-            FROM products WHERE id = ?
-            """,
-            (product_id,),
-        )
-        row = await cursor.fetchone()
+        async with self.reader() as conn:
+            cursor = await conn.execute(_SQL_GET_PRODUCT, (product_id,))
+            row = await cursor.fetchone()
         if not row:
             return None
-        return Product(
-            id=row[0],
-            category_id=row[1],
-            name=row[2],
-            price=row[3],
-            price_from=bool(row[4]),
-            description=row[5],
-            photo_file_id=row[6],
-            is_active=bool(row[7]),
-            created_at=datetime.fromisoformat(row[8]),
-        )
+        return Product(**dict(row))
+
+    async def get_product_name(self, product_id: int) -> Optional[str]:
+        async with self.reader() as conn:
+            cursor = await conn.execute(_SQL_GET_PRODUCT_NAME, (product_id,))
+            row = await cursor.fetchone()
+        return row["name"] if row else None
+
+    async def get_product_names(self, product_ids: Iterable[int]) -> Dict[int, str]:
+        """Fetch the names of several products in one query, keyed by id. Missing ids are simply absent."""
+        ids = list(set(product_ids))
+        if not ids:
+            return {}
+        async with self.reader() as conn:
+            cursor = await conn.execute(_in_list_sql(_SQL_GET_PRODUCT_NAMES_BY_IDS, len(ids)), ids)
+            rows = await cursor.fetchall()
+        return {row["id"]: row["name"] for row in rows}
 
     async def create_order(
         self,
@@ -227,111 +559,54 @@ class Database:
         phone: str,
         status: str = "🟡 Новый",
     ) -> int:
-        async with self._lock:
-            cursor = await self._conn.execute(
-                """
-                INSERT INTO orders (user_id, username, product_id, price, delivery_date, delivery_time, address, card_text, phone, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (user_id, username, product_id, price, delivery_date, delivery_time, address, card_text, phone, status),
-            )
-            await self._conn.commit()
-            return cursor.lastrowid
+        return await self._batcher.submit(
+            _SQL_INSERT_ORDER,
+            (user_id, username, product_id, price, delivery_date, delivery_time, address, card_text, phone, status),
+        )
 
     async def update_order_status(self, order_id: int, status: str) -> None:
-        async with self._lock:
-            await self._conn.execute("UPDATE orders SET status = ? WHERE id = ?", (status, order_id))
-            await self._conn.commit()
+        await self._batcher.submit(_SQL_UPDATE_ORDER_STATUS, (status, order_id))
+
+    async def update_order_status_returning_user(self, order_id: int, status: str) -> Optional[int]:
+        """Update the status and return the order's ``user_id``, or ``None`` if there is no such order."""
+        row = await self._batcher.submit_returning(_SQL_UPDATE_ORDER_STATUS_RETURNING_USER, (status, order_id))
+        return row["user_id"] if row else None
 
     async def get_user_orders(self, user_id: int, limit: int = 10) -> List[Order]:
-        cursor = await self._conn.execute(
-            """
-            SELECT id, user_id, username, product_id, price, delivery_date, delivery_time, address, card_text, phone, status, created_at
-            FROM orders WHERE user_id = ?
-            ORDER BY created_at DESC LIMIT ?
-            """,
-            (user_id, limit),
-        )
-        rows = await cursor.fetchall()
-        return [
-            Order(
-                id=row[0],
-                user_id=row[1],
-                username=row[2],
-                product_id=row[3],
-                price=row[4],
-                delivery_date=row[5],
-                delivery_time=row[6],
-                address=row[7],
-                card_text=row[8],
-                phone=row[9],
-                status=row[10],
-                created_at=datetime.fromisoformat(row[11]),
-            )
-            for row in rows
-        ]
+        async with self.reader() as conn:
+            cursor = await conn.execute(_SQL_GET_USER_ORDERS, (user_id, limit))
+            rows = await cursor.fetchall()
+        return [Order(**dict(row)) for row in rows]
 
     async def get_last_completed_orders(self, user_id: int, limit: int = 3) -> List[Order]:
-        cursor = await self._conn.execute(
-            """
-            SELECT id, user_id, username, product_id, price, delivery_date, delivery_time, address, card_text, phone, status, created_at
-            FROM orders
-            WHERE user_id = ? AND status = '🟢 Завершён'
-            ORDER BY created_at DESC LIMIT ?
-            """,
-            (user_id, limit),
-        )
-        rows = await cursor.fetchall()
-        return [
-            Order(
-                id=row[0],
-                user_id=row[1],
-                username=row[2],
-                product_id=row[3],
-                price=row[4],
-                delivery_date=row[5],
-                delivery_time=row[6],
-                address=row[7],
-                card_text=row[8],
-                phone=row[9],
-                status=row[10],
-                created_at=datetime.fromisoformat(row[11]),
-            )
-            for row in rows
-        ]
+        async with self.reader() as conn:
+            cursor = await conn.execute(_SQL_GET_LAST_COMPLETED_ORDERS, (user_id, limit))
+            rows = await cursor.fetchall()
+        return [Order(**dict(row)) for row in rows]
 
     async def get_order(self, order_id: int) -> Optional[Order]:
-        cursor = await self._conn.execute(
-            """
-            SELECT id, user_id, username, product_id, price, delivery_date, delivery_time, address, card_text, phone, status, created_at
-            FROM orders WHERE id = ?
-            """,
-            (order_id,),
-        )
-        row = await cursor.fetchone()
+        async with self.reader() as conn:
+            cursor = await conn.execute(_SQL_GET_ORDER, (order_id,))
+            row = await cursor.fetchone()
         if not row:
             return None
-        return Order(
-            id=row[0],
-            user_id=row[1],
-            username=row[2],
-            product_id=row[3],
-            price=row[4],
-            delivery_date=row[5],
-            delivery_time=row[6],
-            address=row[7],
-            card_text=row[8],
-            phone=row[9],
-            status=row[10],
-            created_at=datetime.fromisoformat(row[11]),
-        )
+        return Order(**dict(row))
 
     async def save_support_message(self, user_id: int, username: Optional[str], text: str) -> int:
-        async with self._lock:
-            cursor = await self._conn.execute(
-                "INSERT INTO support_messages (user_id, username, text) VALUES (?, ?, ?)", (user_id, username, text)
-            )
-            await self._conn.commit()
-            return cursor.lastrowid
+        return await self._batcher.submit(_SQL_INSERT_SUPPORT_MESSAGE, (user_id, username, text))
+
+    async def enqueue_notification(self, chat_id: int, text: str, reply_markup: Optional[str] = None) -> int:
+        """Persist a message that could not be delivered; ``reply_markup`` is its JSON."""
+        return await self._batcher.submit(_SQL_INSERT_PENDING_NOTIFICATION, (chat_id, text, reply_markup))
+
+    async def get_pending_notifications(self, limit: int = 30) -> List[PendingNotification]:
+        async with self.reader() as conn:
+            cursor = await conn.execute(_SQL_GET_PENDING_NOTIFICATIONS, (limit,))
+            rows = await cursor.fetchall()
+        return [PendingNotification(**dict(row)) for row in rows]
 
+    async def bump_notification_attempts(self, notification_id: int) -> None:
+        await self._batcher.submit(_SQL_BUMP_NOTIFICATION_ATTEMPTS, (notification_id,))
 
+    async def delete_notification(self, notification_id: int) -> None:
+        await self._batcher.submit(_SQL_DELETE_PENDING_NOTIFICATION, (notification_id,))
@@ -7,7 +7,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import NamedTuple, Optional
 
 
 @dataclass
@@ -30,6 +30,17 @@ class Product:
     created_at: datetime
 
 
+class ProductCard(NamedTuple):
+    """Only the product fields shown on a catalog card."""
+
+    id: int
+    name: str
+    price: int
+    price_from: bool
+    description: str
+    photo_file_id: str
+
+
 @dataclass
 class Order:
     id: int
@@ -54,3 +65,12 @@ class SupportMessage:
     text: str
     created_at: datetime
 
+
+@dataclass
+class PendingNotification:
+    id: int
+    chat_id: int
+    text: str
+    reply_markup: Optional[str]
+    attempts: int
+    created_at: datetime
@@ -4,13 +4,15 @@ from aiogram import Dispatcher
 
 from .user import user_router
 from .catalog import catalog_router
-from .orders import orders_router
+from .orders import orders_router, admin_orders_router
 from .admin import admin_router
 
 
 def register_handlers(dp: Dispatcher) -> None:
     dp.include_router(user_router)
     dp.include_router(catalog_router)
+    # Admin order actions first: callbacks it rejects fall through to orders_router's "no rights" answer.
+    dp.include_router(admin_orders_router)
     dp.include_router(orders_router)
     dp.include_router(admin_router)
 
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import re
+
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from ..config import Settings
 from ..database.db import Database
@@ -15,10 +17,25 @@ from ..keyboards.inline import (
 )
 from ..states.admin import AdminAddProductStates, AdminCategoryStates
 from ..utils.helpers import format_price
+from ..utils.messages import edit_or_answer
+from ..utils.session import freeze_markup
 
 
 admin_router = Router(name="admin")
 
+# "1800000", "от 1800000", "От1800000"; ASCII digits only, at most 12 of them.
+_PRICE_RE = re.compile(r"(от\s*)?([0-9]{1,12})", re.IGNORECASE)
+
+_PRODUCT_CONFIRM_KB = freeze_markup(
+    InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text="✅ Сохранить", callback_data="admin:product_save")],
+            [InlineKeyboardButton(text="✏️ Изменить", callback_data="admin:back")],
+            [InlineKeyboardButton(text="❌ Отменить", callback_data="admin:cancel_add")],
+        ]
+    )
+)
+
 
 def is_admin(user_id: int, settings: Settings) -> bool:
     return user_id in settings.admin_ids
@@ -33,7 +50,7 @@ async def admin_entry(message: Message, settings: Settings) -> None:
 
 @admin_router.callback_query(F.data == "admin:back")
 async def admin_back(cb: CallbackQuery) -> None:
-    await cb.message.edit_text("🔧 АДМИН-ПАНЕЛЬ", reply_markup=admin_main_menu_kb())
+    await edit_or_answer(cb.message, "🔧 АДМИН-ПАНЕЛЬ", reply_markup=admin_main_menu_kb())
     await cb.answer()
 
 
@@ -78,15 +95,12 @@ async def admin_add_category_selected(cb: CallbackQuery, state: FSMContext) -> N
 
 @admin_router.message(AdminAddProductStates.waiting_for_price, F.text)
 async def admin_add_price(message: Message, state: FSMContext) -> None:
-    raw = message.text.strip()
-    price_from = False
-    if raw.lower().startswith("от"):
-        price_from = True
-        raw = raw[2:].strip()
-    if not raw.isdigit():
+    match = _PRICE_RE.fullmatch(message.text.strip())
+    if not match:
         await message.answer("Введите число или 'от 1800000'.")
         return
-    price = int(raw)
+    price_from = match.group(1) is not None
+    price = int(match.group(2))
     await state.update_data(price=price, price_from=price_from)
     await state.set_state(AdminAddProductStates.waiting_for_description)
     await message.answer("📋 Введите описание букета (до 500 символов)")
@@ -107,16 +121,7 @@ async def admin_add_description(message: Message, state: FSMContext) -> None:
         f"📋 Описание:\n{description}\n\n"
         "Всё верно?"
     )
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-
-    kb = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="✅ Сохранить", callback_data="admin:product_save")],
-            [InlineKeyboardButton(text="✏️ Изменить", callback_data="admin:back")],
-            [InlineKeyboardButton(text="❌ Отменить", callback_data="admin:cancel_add")],
-        ]
-    )
-    await message.answer_photo(data["photo_file_id"], caption=summary, reply_markup=kb)
+    await message.answer_photo(data["photo_file_id"], caption=summary, reply_markup=_PRODUCT_CONFIRM_KB)
 
 
 @admin_router.callback_query(AdminAddProductStates.waiting_for_confirmation, F.data == "admin:product_save")
@@ -150,7 +155,7 @@ async def admin_categories(cb: CallbackQuery, db: Database, settings: Settings,
     await state.set_state(AdminCategoryStates.waiting_for_action)
     cats = await db.get_categories()
     kb = admin_categories_kb(cats)
-    await cb.message.edit_text("📂 Управление категориями", reply_markup=kb)
+    await edit_or_answer(cb.message, "📂 Управление категориями", reply_markup=kb)
     await cb.answer()
 
 
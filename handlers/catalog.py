@@ -3,21 +3,33 @@
 from __future__ import annotations
 
 import math
-from typing import List
+import time
+from collections import OrderedDict
+from typing import List, Tuple
 
 from aiogram import Router, F
 from aiogram.types import CallbackQuery, Message, InputMediaPhoto
 
 from ..database.db import Database
-from ..keyboards.inline import categories_kb, products_navigation_kb, product_list_action_kb, product_detail_kb, back_to_categories_kb
+from ..database.models import ProductCard
+from ..keyboards.inline import categories_kb, products_navigation_kb, product_list_action_kb, product_detail_kb, back_to_categories_kb, order_date_kb
 from ..keyboards.reply import main_menu_kb
-from ..utils.helpers import format_price
+from ..states.order import OrderStates
+from ..utils.helpers import format_price, is_after_six_pm
+from ..utils.messages import edit_or_answer, send_in_order
 
 
 catalog_router = Router(name="catalog")
 
 PAGE_SIZE = 5
 
+# Rendered listing pages keyed by (category_id, page, products_epoch). Edits made by this
+# process bump the epoch; the TTL bounds staleness from edits made by other workers.
+_PageEntry = Tuple[int, List[ProductCard], int, str]
+_PAGE_CACHE: "OrderedDict[Tuple[int, int, int], Tuple[float, _PageEntry]]" = OrderedDict()
+_PAGE_CACHE_SIZE = 256
+_PAGE_CACHE_TTL = 60.0
+
 
 @catalog_router.message(F.text == "🛍 Магазин")
 async def show_categories(message: Message, db: Database) -> None:
@@ -28,7 +40,7 @@ async def show_categories(message: Message, db: Database) -> None:
 @catalog_router.callback_query(F.data == "back_to_categories")
 async def cb_back_to_categories(cb: CallbackQuery, db: Database) -> None:
     categories = await db.get_categories()
-    await cb.message.answer("Категории:", reply_markup=categories_kb(categories))
+    await edit_or_answer(cb.message, "Категории:", reply_markup=categories_kb(categories))
     await cb.answer()
 
 
@@ -43,35 +55,60 @@ async def open_category(cb: CallbackQuery, db: Database) -> None:
 @catalog_router.callback_query(F.data.startswith("next_page:") | F.data.startswith("prev_page:"))
 async def paginate_products(cb: CallbackQuery, db: Database) -> None:
     parts = cb.data.split(":")
-    _, category_id_str, page_str = parts
-    category_id, page = int(category_id_str), int(page_str)
+    # Buttons rendered by older versions may carry a trailing catalog version; it is ignored.
+    category_id, page = int(parts[1]), int(parts[2])
     await send_products_page(cb, db, category_id, page)
     await cb.answer()
 
 
-async def send_products_page(cb: CallbackQuery, db: Database, category_id: int, page: int) -> None:
-    total_products = await db.count_products_in_category(category_id)
+async def _load_products_page(db: Database, category_id: int, page: int) -> _PageEntry:
+    cards, total_products = await db.get_products_page_cards(
+        category_id, limit=PAGE_SIZE, offset=(page - 1) * PAGE_SIZE
+    )
+    if not cards and page > 1:
+        # Stale navigation past the last page: clamp and fetch the last page instead.
+        total_products = await db.count_products_in_category(category_id)
+        page = max(1, math.ceil(total_products / PAGE_SIZE))
+        cards, total_products = await db.get_products_page_cards(
+            category_id, limit=PAGE_SIZE, offset=(page - 1) * PAGE_SIZE
+        )
     total_pages = max(1, math.ceil(total_products / PAGE_SIZE))
-    page = min(max(1, page), total_pages)
-    offset = (page - 1) * PAGE_SIZE
-    products = await db.get_products_by_category(category_id, limit=PAGE_SIZE, offset=offset)
+    category_name = await db.get_category_name(category_id) or "Категория"
+    return page, cards, total_pages, category_name
+
+
+async def send_products_page(cb: CallbackQuery, db: Database, category_id: int, page: int) -> None:
+    page = max(1, page)
+    cache_key = (category_id, page, db.products_epoch)
+    cached = _PAGE_CACHE.get(cache_key)
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < _PAGE_CACHE_TTL:
+        _PAGE_CACHE.move_to_end(cache_key)
+        entry = cached[1]
+    else:
+        entry = await _load_products_page(db, category_id, page)
+        _PAGE_CACHE[cache_key] = (now, entry)
+        _PAGE_CACHE.move_to_end(cache_key)
+        if len(_PAGE_CACHE) > _PAGE_CACHE_SIZE:
+            _PAGE_CACHE.popitem(last=False)
+    page, cards, total_pages, category_name = entry
 
-    categories = await db.get_categories()
-    category_name = next((c.name for c in categories if c.id == category_id), "Категория")
     header = f"Товары в категории {category_name} (страница {page} из {total_pages})"
     await cb.message.answer(header)
 
-    for product in products:
-        caption = (
-            f"{product.name}\n"
-            f"Цена: {format_price(product.price, product.price_from)}\n\n"
-            f"{product.description}"
-        )
-        await cb.message.answer_photo(
-            product.photo_file_id,
-            caption=caption,
-            reply_markup=product_list_action_kb(product.id, category_id, page),
+    # Cards go out in page order; a failed card must not hide the navigation below.
+    await send_in_order(
+        cb.message.answer_photo(
+            card.photo_file_id,
+            caption=(
+                f"{card.name}\n"
+                f"Цена: {format_price(card.price, card.price_from)}\n\n"
+                f"{card.description}"
+            ),
+            reply_markup=product_list_action_kb(card.id, category_id, page),
         )
+        for card in cards
+    )
 
     has_prev = page > 1
     has_next = page < total_pages
@@ -110,10 +147,6 @@ async def product_view(cb: CallbackQuery, db: Database) -> None:
 
 @catalog_router.callback_query(F.data.startswith("order_start:"))
 async def order_start(cb: CallbackQuery, db: Database, state, bot) -> None:  # type: ignore[override]
-    from ..states.order import OrderStates
-    from ..keyboards.inline import order_date_kb
-    from ..utils.helpers import is_after_six_pm
-
     _, product_id_str, category_id_str, page_str = cb.data.split(":")
     product_id = int(product_id_str)
     product = await db.get_product(product_id)
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+from collections import ChainMap
 from datetime import date, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from ..config import Settings
 from ..database.db import Database
@@ -20,11 +21,84 @@ from ..keyboards.inline import (
 )
 from ..keyboards.reply import main_menu_kb, phone_request_kb, location_request_kb
 from ..states.order import OrderStates
-from ..utils.helpers import format_price, is_phone_valid, normalize_card_text
-from ..utils.notifications import notify_admins
+from ..utils.fsm import update_and_transition
+from ..utils.helpers import format_price, is_phone_valid, normalize_card_text, shop_today
+from ..utils.messages import send_in_order
+from ..utils.notifications import notify_admins_in_background
+from ..utils.session import freeze_markup
 
 
 orders_router = Router(name="orders")
+# Admin-only order actions. Must be included before ``orders_router``, whose
+# ``admin_order_denied`` answers the callbacks this router's filter rejects.
+admin_orders_router = Router(name="admin_orders")
+
+
+def _from_admin(cb: CallbackQuery, settings: Settings) -> bool:
+    return cb.from_user.id in settings.admin_ids
+
+
+admin_orders_router.callback_query.filter(_from_admin)
+
+_ORDER_CONFIRM_KB = freeze_markup(
+    InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text="✅ Подтвердить заказ", callback_data="order_confirm")],
+            [InlineKeyboardButton(text="✏️ Изменить", callback_data="order_edit")],
+            [InlineKeyboardButton(text="❌ Отменить заказ", callback_data="order_cancel")],
+        ]
+    )
+)
+
+_ORDER_DETAILS_TEMPLATE = (
+    "📋 ЗАКАЗ #{id}\n\n"
+    "{status}\n\n"
+    "🌹 Букет: {product_name}\n"
+    "💰 Сумма: {price}\n"
+    "💳 Предоплата: {prepayment}\n\n"
+    "📅 Дата доставки: {delivery_date}\n"
+    "⏰ Время: {delivery_time}\n"
+    "📍 Адрес: {address}\n"
+    "💌 Открытка: {card_text}\n"
+    "📞 Телефон: {phone}\n"
+    "🕐 Создан: {created_at:%Y-%m-%d %H:%M}"
+)
+
+_SUMMARY_TEMPLATE = (
+    "📋 ПОДТВЕРЖДЕНИЕ ЗАКАЗА\n\n"
+    "🌹 Букет: {product_name}\n"
+    "💰 Цена: {price}\n\n"
+    "📅 Дата: {delivery_date}\n"
+    "⏰ Время: {delivery_time}\n"
+    "📍 Адрес: {address}\n"
+    "💌 Открытка: {card_text}\n"
+    "📞 Телефон: {phone}\n\n"
+    "💳 Предоплата: {prepayment}\n\n"
+    "Всё верно?"
+)
+
+_SUMMARY_DEFAULTS: Dict[str, Any] = {
+    "product_name": "Букет",
+    "product_price": 0,
+    "delivery_date": None,
+    "delivery_time": None,
+    "address": None,
+    "card_text": "Без открытки",
+    "phone": None,
+}
+
+_ADMIN_ORDER_TEMPLATE = (
+    "🔔 НОВЫЙ ЗАКАЗ #{order_id}\n\n"
+    "👤 Клиент: @{username} (ID: {user_id})\n"
+    "🌹 Букет: {product_name}\n"
+    "💰 Сумма: {price}\n"
+    "💳 Предоплата: {prepayment}\n\n"
+    "📅 Дата: {delivery_date}\n"
+    "⏰ Время: {delivery_time}\n"
+    "📍 Адрес: {address}\n"
+    "💌 Открытка: {card_text}\n"
+    "📞 Телефон: {phone}"
+)
 
 
 @orders_router.message(F.text == "📦 Заказы")
@@ -33,16 +107,18 @@ async def show_orders(message: Message, db: Database) -> None:
     if not orders:
         await message.answer("У вас пока нет заказов 😊\nНажмите «🛍 Магазин», чтобы сделать первый!")
         return
-    text_lines = ["📦 ВАШИ ЗАКАЗЫ", ""]
+    product_names = await db.get_product_names(order.product_id for order in orders)
+    await message.answer("📦 ВАШИ ЗАКАЗЫ")
+    sends = []
     for idx, order in enumerate(orders, start=1):
-        text_lines.append(f"{idx}️⃣ Заказ #{order.id} — {order.status}")
-        product = await db.get_product(order.product_id)
-        if product:
-            text_lines.append(f"   🌹 {product.name}")
-        text_lines.append(f"   📅 Доставка: {order.delivery_date}, {order.delivery_time}")
-        text_lines.append(f"   💰 {format_price(order.price)}")
-        text_lines.append("")
-        await message.answer("\n".join(text_lines[-5:]), reply_markup=orders_list_nav_kb(order.id))
+        lines = [f"{idx}️⃣ Заказ #{order.id} — {order.status}"]
+        product_name = product_names.get(order.product_id)
+        if product_name:
+            lines.append(f"   🌹 {product_name}")
+        lines.append(f"   📅 Доставка: {order.delivery_date}, {order.delivery_time}")
+        lines.append(f"   💰 {format_price(order.price)}")
+        sends.append(message.answer("\n".join(lines), reply_markup=orders_list_nav_kb(order.id)))
+    await send_in_order(sends)
     await message.answer("🏠 Главное меню", reply_markup=main_menu_kb())
 
 
@@ -53,21 +129,19 @@ async def order_details(cb: CallbackQuery, db: Database) -> None:
     if not order:
         await cb.answer("Заказ не найден", show_alert=True)
         return
-    product = await db.get_product(order.product_id)
-    product_name = product.name if product else "Букет"
-    card_text = order.card_text or "Без открытки"
-    text = (
-        f"📋 ЗАКАЗ #{order.id}\n\n"
-        f"{order.status}\n\n"
-        f"🌹 Букет: {product_name}\n"
-        f"💰 Сумма: {format_price(order.price)}\n"
-        f"💳 Предоплата: {format_price(int(order.price * 0.5))}\n\n"
-        f"📅 Дата доставки: {order.delivery_date}\n"
-        f"⏰ Время: {order.delivery_time}\n"
-        f"📍 Адрес: {order.address}\n"
-        f"💌 Открытка: {card_text}\n"
-        f"📞 Телефон: {order.phone}\n"
-        f"🕐 Создан: {order.created_at.strftime('%Y-%m-%d %H:%M')}"
+    product_name = await db.get_product_name(order.product_id) or "Букет"
+    text = _ORDER_DETAILS_TEMPLATE.format(
+        id=order.id,
+        status=order.status,
+        product_name=product_name,
+        price=format_price(order.price),
+        prepayment=format_price(int(order.price * 0.5)),
+        delivery_date=order.delivery_date,
+        delivery_time=order.delivery_time,
+        address=order.address,
+        card_text=order.card_text or "Без открытки",
+        phone=order.phone,
+        created_at=order.created_at,
     )
     await cb.message.answer(text, reply_markup=orders_list_nav_kb(order.id))
     await cb.answer()
@@ -80,13 +154,13 @@ async def repeat_order(message: Message, db: Database, state: FSMContext) -> Non
         await message.answer("У вас пока нет завершённых заказов для повтора 😊")
         return
     await state.set_data({})
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
     header = ["🔁 ПОВТОРИТЬ ЗАКАЗ", "", "Выберите заказ из истории:"]
     await message.answer("\n".join(header))
+    product_names = await db.get_product_names(order.product_id for order in orders)
+    sends = []
     for order in orders:
-        product = await db.get_product(order.product_id)
-        product_name = product.name if product else "Букет"
+        product_name = product_names.get(order.product_id, "Букет")
         text = (
             f"🔁 Заказ #{order.id}\n"
             f"🌹 {product_name}\n"
@@ -96,7 +170,8 @@ async def repeat_order(message: Message, db: Database, state: FSMContext) -> Non
         kb = InlineKeyboardMarkup(
             inline_keyboard=[[InlineKeyboardButton(text=f"🔁 Повторить заказ #{order.id}", callback_data=f"repeat_order:{order.id}")]]
         )
-        await message.answer(text, reply_markup=kb)
+        sends.append(message.answer(text, reply_markup=kb))
+    await send_in_order(sends)
     await message.answer("🏠 Главное меню", reply_markup=main_menu_kb())
 
 
@@ -107,8 +182,7 @@ async def repeat_order_callback(cb: CallbackQuery, state: FSMContext, db: Databa
     if not order:
         await cb.answer("Заказ не найден", show_alert=True)
         return
-    product = await db.get_product(order.product_id)
-    product_name = product.name if product else "Букет"
+    product_name = await db.get_product_name(order.product_id) or "Букет"
     await state.update_data(
         product_id=order.product_id,
         product_price=order.price,
@@ -124,26 +198,24 @@ async def repeat_order_callback(cb: CallbackQuery, state: FSMContext, db: Databa
 async def date_selected(cb: CallbackQuery, state: FSMContext) -> None:
     value = cb.data.split(":", 1)[1]
     if value == "today":
-        selected = date.today()
+        selected = shop_today()
     elif value == "tomorrow":
-        selected = date.today() + timedelta(days=1)
+        selected = shop_today() + timedelta(days=1)
     else:
         selected = date.fromisoformat(value)
-    await state.update_data(delivery_date=selected.isoformat())
+    await update_and_transition(state, OrderStates.waiting_for_delivery_time, delivery_date=selected.isoformat())
     await cb.message.answer("⏰ Выберите время доставки:", reply_markup=order_time_kb())
-    await state.set_state(OrderStates.waiting_for_delivery_time)
     await cb.answer()
 
 
 @orders_router.callback_query(OrderStates.waiting_for_delivery_time, F.data.startswith("time_selected:"))
 async def time_selected(cb: CallbackQuery, state: FSMContext) -> None:
     slot = cb.data.split(":", 1)[1]
-    await state.update_data(delivery_time=slot)
+    await update_and_transition(state, OrderStates.waiting_for_address, delivery_time=slot)
     await cb.message.answer(
         "📍 Укажите адрес доставки:",
         reply_markup=location_request_kb(),
     )
-    await state.set_state(OrderStates.waiting_for_address)
     await cb.answer()
 
 
@@ -174,9 +246,8 @@ async def address_text(message: Message, state: FSMContext) -> None:
     if len(message.text.strip()) < 10:
         await message.answer("Пожалуйста, укажите полный адрес (минимум 10 символов).")
         return
-    await state.update_data(address=message.text.strip())
+    await update_and_transition(state, OrderStates.waiting_for_card_text, address=message.text.strip())
     await message.answer("💌 Хотите добавить открытку?", reply_markup=card_text_kb())
-    await state.set_state(OrderStates.waiting_for_card_text)
 
 
 @orders_router.callback_query(OrderStates.waiting_for_card_text, F.data == "card_write")
@@ -187,8 +258,7 @@ async def card_write(cb: CallbackQuery, state: FSMContext) -> None:
 
 @orders_router.callback_query(OrderStates.waiting_for_card_text, F.data == "card_skip")
 async def card_skip(cb: CallbackQuery, state: FSMContext) -> None:
-    await state.update_data(card_text=None)
-    await ask_phone(cb.message, state)
+    await ask_phone(cb.message, state, card_text=None)
     await cb.answer()
 
 
@@ -202,21 +272,20 @@ async def card_back(cb: CallbackQuery, state: FSMContext) -> None:
 @orders_router.message(OrderStates.waiting_for_card_text, F.text)
 async def card_text(message: Message, state: FSMContext) -> None:
     text = normalize_card_text(message.text)
-    await state.update_data(card_text=text)
     await message.answer(f"Ваша открытка:\n\n{text}\n\nВсё верно?")
-    await ask_phone(message, state)
+    await ask_phone(message, state, card_text=text)
 
 
-async def ask_phone(message: Message, state: FSMContext) -> None:
-    await state.set_state(OrderStates.waiting_for_phone)
+async def ask_phone(message: Message, state: FSMContext, **data: Any) -> None:
+    await update_and_transition(state, OrderStates.waiting_for_phone, **data)
     await message.answer("📞 Укажите контактный номер для связи:", reply_markup=phone_request_kb())
 
 
 @orders_router.message(OrderStates.waiting_for_phone, F.contact)
 async def phone_contact(message: Message, state: FSMContext) -> None:
     phone = message.contact.phone_number
-    await state.update_data(phone=phone)
-    await show_summary(message, state)
+    data = await update_and_transition(state, OrderStates.waiting_for_confirmation, phone=phone)
+    await show_summary(message, data)
 
 
 @orders_router.message(OrderStates.waiting_for_phone, F.text)
@@ -225,50 +294,26 @@ async def phone_text(message: Message, state: FSMContext) -> None:
     if not is_phone_valid(phone):
         await message.answer("Введите номер в формате +XX XXX XXX XXXX или 0XXXXXXXXX.")
         return
-    await state.update_data(phone=phone)
-    await show_summary(message, state)
+    data = await update_and_transition(state, OrderStates.waiting_for_confirmation, phone=phone)
+    await show_summary(message, data)
 
 
-async def show_summary(message: Message, state: FSMContext) -> None:
-    data = await state.get_data()
-    product_name = data.get("product_name", "Букет")
-    price = data.get("product_price", 0)
-    delivery_date = data.get("delivery_date")
-    delivery_time = data.get("delivery_time")
-    address = data.get("address")
-    card_text = data.get("card_text") or "Без открытки"
-    phone = data.get("phone")
-    prepayment = int(price * 0.5)
-
-    summary = (
-        "📋 ПОДТВЕРЖДЕНИЕ ЗАКАЗА\n\n"
-        f"🌹 Букет: {product_name}\n"
-        f"💰 Цена: {format_price(price)}\n\n"
-        f"📅 Дата: {delivery_date}\n"
-        f"⏰ Время: {delivery_time}\n"
-        f"📍 Адрес: {address}\n"
-        f"💌 Открытка: {card_text}\n"
-        f"📞 Телефон: {phone}\n\n"
-        f"💳 Предоплата: {format_price(prepayment)}\n\n"
-        "Всё верно?"
+async def show_summary(message: Message, data: Dict[str, Any]) -> None:
+    """Render the confirmation step from the FSM data the caller has just written."""
+    # Unset and skipped fields (e.g. card_text=None) fall through to the defaults.
+    fields = ChainMap({key: value for key, value in data.items() if value not in (None, "")}, _SUMMARY_DEFAULTS)
+    price = fields["product_price"]
+    summary = _SUMMARY_TEMPLATE.format_map(
+        ChainMap({"price": format_price(price), "prepayment": format_price(int(price * 0.5))}, fields)
     )
     await message.answer(
         summary,
         reply_markup=create_confirmation_kb(),
     )
-    await state.set_state(OrderStates.waiting_for_confirmation)
-
 
-def create_confirmation_kb():
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
-    return InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="✅ Подтвердить заказ", callback_data="order_confirm")],
-            [InlineKeyboardButton(text="✏️ Изменить", callback_data="order_edit")],
-            [InlineKeyboardButton(text="❌ Отменить заказ", callback_data="order_cancel")],
-        ]
-    )
+def create_confirmation_kb() -> InlineKeyboardMarkup:
+    return _ORDER_CONFIRM_KB
 
 
 @orders_router.callback_query(OrderStates.waiting_for_confirmation, F.data == "order_edit")
@@ -300,27 +345,26 @@ async def order_confirm(cb: CallbackQuery, state: FSMContext, db: Database, sett
     )
     prepayment = int(product.price * settings.prepayment_ratio)
 
-    admin_text = (
-        f"🔔 НОВЫЙ ЗАКАЗ #{order_id}\n\n"
-        f"👤 Клиент: @{cb.from_user.username or 'unknown'} (ID: {cb.from_user.id})\n"
-        f"🌹 Букет: {product.name}\n"
-        f"💰 Сумма: {format_price(product.price)}\n"
-        f"💳 Предоплата: {format_price(prepayment)}\n\n"
-        f"📅 Дата: {data['delivery_date']}\n"
-        f"⏰ Время: {data['delivery_time']}\n"
-        f"📍 Адрес: {data['address']}\n"
-        f"💌 Открытка: {data.get('card_text') or 'Без открытки'}\n"
-        f"📞 Телефон: {data['phone']}"
+    admin_text = _ADMIN_ORDER_TEMPLATE.format(
+        order_id=order_id,
+        username=cb.from_user.username or "unknown",
+        user_id=cb.from_user.id,
+        product_name=product.name,
+        price=format_price(product.price),
+        prepayment=format_price(prepayment),
+        delivery_date=data["delivery_date"],
+        delivery_time=data["delivery_time"],
+        address=data["address"],
+        card_text=data.get("card_text") or "Без открытки",
+        phone=data["phone"],
     )
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-
     admin_kb = InlineKeyboardMarkup(
         inline_keyboard=[
             [InlineKeyboardButton(text="✅ Принять в работу", callback_data=f"admin_order_accept:{order_id}")],
             [InlineKeyboardButton(text="❌ Отклонить", callback_data=f"admin_order_reject:{order_id}")],
         ]
     )
-    await notify_admins(bot, settings.admin_ids, admin_text, reply_markup=admin_kb)
+    notify_admins_in_background(bot, settings.admin_ids, admin_text, db=db, reply_markup=admin_kb)
 
     await cb.message.answer(
         f"✅ Заказ #{order_id} оформлен!\n\n"
@@ -338,41 +382,35 @@ async def order_confirm(cb: CallbackQuery, state: FSMContext, db: Database, sett
     await cb.answer()
 
 
-def _ensure_admin(user_id: int, settings: Settings) -> bool:
-    return user_id in settings.admin_ids
+@orders_router.callback_query(F.data.startswith("admin_order_"))
+async def admin_order_denied(cb: CallbackQuery) -> None:
+    # Reached only when ``admin_orders_router`` rejected the sender.
+    await cb.answer("Недостаточно прав", show_alert=True)
 
 
-@orders_router.callback_query(F.data.startswith("admin_order_accept:"))
-async def admin_order_accept(cb: CallbackQuery, db: Database, settings: Settings, bot) -> None:
-    if not _ensure_admin(cb.from_user.id, settings):
-        await cb.answer("Недостаточно прав", show_alert=True)
-        return
+@admin_orders_router.callback_query(F.data.startswith("admin_order_accept:"))
+async def admin_order_accept(cb: CallbackQuery, db: Database, bot) -> None:
     order_id = int(cb.data.split(":")[1])
-    order = await db.get_order(order_id)
-    if not order:
+    user_id = await db.update_order_status_returning_user(order_id, "🔵 В работе")
+    if user_id is None:
         await cb.answer("Заказ не найден", show_alert=True)
         return
-    await db.update_order_status(order_id, "🔵 В работе")
     try:
-        await bot.send_message(order.user_id, f"Ваш заказ #{order_id} принят в работу! 🚀")
+        await bot.send_message(user_id, f"Ваш заказ #{order_id} принят в работу! 🚀")
     except Exception:
         pass
     await cb.answer("Статус обновлён")
 
 
-@orders_router.callback_query(F.data.startswith("admin_order_reject:"))
-async def admin_order_reject(cb: CallbackQuery, db: Database, settings: Settings, bot) -> None:
-    if not _ensure_admin(cb.from_user.id, settings):
-        await cb.answer("Недостаточно прав", show_alert=True)
-        return
+@admin_orders_router.callback_query(F.data.startswith("admin_order_reject:"))
+async def admin_order_reject(cb: CallbackQuery, db: Database, bot) -> None:
     order_id = int(cb.data.split(":")[1])
-    order = await db.get_order(order_id)
-    if not order:
+    user_id = await db.update_order_status_returning_user(order_id, "❌ Отменён")
+    if user_id is None:
         await cb.answer("Заказ не найден", show_alert=True)
         return
-    await db.update_order_status(order_id, "❌ Отменён")
     try:
-        await bot.send_message(order.user_id, f"К сожалению, заказ #{order_id} отклонён. Свяжитесь с поддержкой для уточнения.")
+        await bot.send_message(user_id, f"К сожалению, заказ #{order_id} отклонён. Свяжитесь с поддержкой для уточнения.")
     except Exception:
         pass
     await cb.answer("Статус обновлён")
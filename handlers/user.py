@@ -13,7 +13,7 @@ from ..config import Settings
 from ..database.db import Database
 from ..keyboards.inline import support_menu_kb, support_faq_kb
 from ..keyboards.reply import main_menu_kb
-from ..utils.notifications import notify_admins
+from ..utils.notifications import notify_admins_in_background
 
 
 class SupportState(StatesGroup):
@@ -111,7 +111,7 @@ async def receive_support_message(message: Message, state: FSMContext, settings:
             [InlineKeyboardButton(text="📋 Открыть профиль", url=f"https://t.me/{message.from_user.username}")],
         ]
     )
-    await notify_admins(bot, settings.admin_ids, admin_text, reply_markup=kb)
+    notify_admins_in_background(bot, settings.admin_ids, admin_text, db=db, reply_markup=kb)
     await message.answer("Спасибо! Сообщение отправлено флористу. Мы ответим в ближайшее время.")
     await state.clear()
 
@@ -4,7 +4,8 @@ from .reply import main_menu_kb, phone_request_kb, location_request_kb  # noqa:
 from .inline import (  # noqa: F401
     categories_kb,
     products_navigation_kb,
-    product_action_kb,
+    product_list_action_kb,
+    product_detail_kb,
     back_to_categories_kb,
     order_date_kb,
     order_time_kb,
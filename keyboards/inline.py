@@ -3,11 +3,19 @@
 from __future__ import annotations
 
 from datetime import date, timedelta
+from functools import lru_cache
 from typing import Iterable, List
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from ..database.models import Category, Order, Product
+from ..utils.helpers import shop_today
+from ..utils.session import freeze_markup
+
+
+# Keyboards that depend only on small integer ids are shared between calls;
+# markups are only read when sending, so returning the same instance is safe.
+_KB_CACHE_SIZE = 1024
 
 
 def categories_kb(categories: Iterable[Category]) -> InlineKeyboardMarkup:
@@ -34,6 +42,7 @@ def products_navigation_kb(category_id: int, page: int, has_prev: bool, has_next
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@lru_cache(maxsize=_KB_CACHE_SIZE)
 def product_list_action_kb(product_id: int, category_id: int, page: int) -> InlineKeyboardMarkup:
     """Actions shown on product cards inside the paginated list."""
     return InlineKeyboardMarkup(
@@ -43,6 +52,7 @@ def product_list_action_kb(product_id: int, category_id: int, page: int) -> Inli
     )
 
 
+@lru_cache(maxsize=_KB_CACHE_SIZE)
 def product_detail_kb(product_id: int, category_id: int, page: int) -> InlineKeyboardMarkup:
     """Actions on the detailed product card."""
     return InlineKeyboardMarkup(
@@ -53,12 +63,21 @@ def product_detail_kb(product_id: int, category_id: int, page: int) -> InlineKey
     )
 
 
+_BACK_TO_CATEGORIES_KB = freeze_markup(InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text="📂 К категориям", callback_data="back_to_categories")]]))
+
+
 def back_to_categories_kb() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text="📂 К категориям", callback_data="back_to_categories")]])
+    return _BACK_TO_CATEGORIES_KB
 
 
 def order_date_kb(include_today: bool) -> InlineKeyboardMarkup:
     """Builds keyboard for selecting delivery date."""
+    return _order_date_kb(include_today, shop_today().toordinal())
+
+
+@lru_cache(maxsize=4)
+def _order_date_kb(include_today: bool, today_ordinal: int) -> InlineKeyboardMarkup:
+    # Keyed by the current day, so yesterday's grid simply ages out of the cache.
     buttons: List[List[InlineKeyboardButton]] = []
     row: List[InlineKeyboardButton] = []
     if include_today:
@@ -67,7 +86,7 @@ def order_date_kb(include_today: bool) -> InlineKeyboardMarkup:
     buttons.append(row)
 
     # Next 14 days calendar style grid
-    today = date.today()
+    today = date.fromordinal(today_ordinal)
     days = []
     for i in range(14):
         target = today + timedelta(days=i)
@@ -79,8 +98,8 @@ def order_date_kb(include_today: bool) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def order_time_kb() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(
+_ORDER_TIME_KB = freeze_markup(
+    InlineKeyboardMarkup(
         inline_keyboard=[
             [InlineKeyboardButton(text="09:00 - 12:00", callback_data="time_selected:09:00-12:00")],
             [InlineKeyboardButton(text="12:00 - 15:00", callback_data="time_selected:12:00-15:00")],
@@ -90,20 +109,30 @@ def order_time_kb() -> InlineKeyboardMarkup:
             [InlineKeyboardButton(text="❌ Отменить", callback_data="order_cancel")],
         ]
     )
+)
 
 
-def card_text_kb() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(
+def order_time_kb() -> InlineKeyboardMarkup:
+    return _ORDER_TIME_KB
+
+
+_CARD_TEXT_KB = freeze_markup(
+    InlineKeyboardMarkup(
         inline_keyboard=[
             [InlineKeyboardButton(text="✍️ Написать текст", callback_data="card_write")],
             [InlineKeyboardButton(text="❌ Без открытки", callback_data="card_skip")],
             [InlineKeyboardButton(text="⬅️ Назад", callback_data="card_back")],
         ]
     )
+)
 
 
-def support_menu_kb() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(
+def card_text_kb() -> InlineKeyboardMarkup:
+    return _CARD_TEXT_KB
+
+
+_SUPPORT_MENU_KB = freeze_markup(
+    InlineKeyboardMarkup(
         inline_keyboard=[
             [InlineKeyboardButton(text="💬 Написать флористу", callback_data="contact_florist")],
             [InlineKeyboardButton(text="🚚 Условия доставки", callback_data="delivery_info")],
@@ -112,16 +141,26 @@ def support_menu_kb() -> InlineKeyboardMarkup:
             [InlineKeyboardButton(text="🏠 Главное меню", callback_data="main_menu")],
         ]
     )
+)
 
 
-def support_faq_kb() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(
+def support_menu_kb() -> InlineKeyboardMarkup:
+    return _SUPPORT_MENU_KB
+
+
+_SUPPORT_FAQ_KB = freeze_markup(
+    InlineKeyboardMarkup(
         inline_keyboard=[[InlineKeyboardButton(text="🏠 Главное меню", callback_data="main_menu")]]
     )
+)
 
 
-def admin_main_menu_kb() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(
+def support_faq_kb() -> InlineKeyboardMarkup:
+    return _SUPPORT_FAQ_KB
+
+
+_ADMIN_MAIN_MENU_KB = freeze_markup(
+    InlineKeyboardMarkup(
         inline_keyboard=[
             [InlineKeyboardButton(text="➕ Добавить товар", callback_data="admin:add_product")],
             [InlineKeyboardButton(text="✏️ Редактировать товар", callback_data="admin:edit_product")],
@@ -132,6 +171,11 @@ def admin_main_menu_kb() -> InlineKeyboardMarkup:
             [InlineKeyboardButton(text="🏠 Главное меню", callback_data="main_menu")],
         ]
     )
+)
+
+
+def admin_main_menu_kb() -> InlineKeyboardMarkup:
+    return _ADMIN_MAIN_MENU_KB
 
 
 def admin_categories_kb(categories: Iterable[Category]) -> InlineKeyboardMarkup:
@@ -145,6 +189,7 @@ def admin_categories_kb(categories: Iterable[Category]) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@lru_cache(maxsize=_KB_CACHE_SIZE)
 def admin_edit_product_kb(product_id: int) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -160,6 +205,7 @@ def admin_edit_product_kb(product_id: int) -> InlineKeyboardMarkup:
     )
 
 
+@lru_cache(maxsize=_KB_CACHE_SIZE)
 def orders_list_nav_kb(order_id: int) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
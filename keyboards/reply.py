@@ -2,10 +2,11 @@
 
 from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
 
+from ..utils.session import freeze_markup
 
-def main_menu_kb() -> ReplyKeyboardMarkup:
-    """Main menu with canonical buttons."""
-    return ReplyKeyboardMarkup(
+
+_MAIN_MENU_KB = freeze_markup(
+    ReplyKeyboardMarkup(
         keyboard=[
             [KeyboardButton(text="🛍 Магазин"), KeyboardButton(text="📦 Заказы")],
             [KeyboardButton(text="🔁 Повторить заказ"), KeyboardButton(text="💬 Поддержка")],
@@ -13,22 +14,38 @@ def main_menu_kb() -> ReplyKeyboardMarkup:
         resize_keyboard=True,
         input_field_placeholder="Выберите действие",
     )
+)
 
 
-def phone_request_kb() -> ReplyKeyboardMarkup:
-    """Reply keyboard to request phone contact."""
-    return ReplyKeyboardMarkup(
+def main_menu_kb() -> ReplyKeyboardMarkup:
+    """Main menu with canonical buttons."""
+    return _MAIN_MENU_KB
+
+
+_PHONE_REQUEST_KB = freeze_markup(
+    ReplyKeyboardMarkup(
         keyboard=[[KeyboardButton(text="📱 Отправить мой номер", request_contact=True)]],
         resize_keyboard=True,
         one_time_keyboard=True,
     )
+)
 
 
-def location_request_kb() -> ReplyKeyboardMarkup:
-    """Reply keyboard to request user location."""
-    return ReplyKeyboardMarkup(
+def phone_request_kb() -> ReplyKeyboardMarkup:
+    """Reply keyboard to request phone contact."""
+    return _PHONE_REQUEST_KB
+
+
+_LOCATION_REQUEST_KB = freeze_markup(
+    ReplyKeyboardMarkup(
         keyboard=[[KeyboardButton(text="📍 Отправить геолокацию", request_location=True)]],
         resize_keyboard=True,
         one_time_keyboard=True,
     )
+)
+
+
+def location_request_kb() -> ReplyKeyboardMarkup:
+    """Reply keyboard to request user location."""
+    return _LOCATION_REQUEST_KB
 
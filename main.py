@@ -2,42 +2,139 @@
 
 import asyncio
 import logging
+import signal
 
 from aiogram import Bot, Dispatcher
+from aiogram.client.default import DefaultBotProperties
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 
-from config import Settings
+try:  # libuv-backed event loop; not available on Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
+from config import Settings, get_settings
 from database.db import Database
 from handlers import register_handlers
+from middlewares import ConcurrencyMiddleware
+from utils.notifications import drain_background_notifications, replay_pending_notifications
+from utils.ratelimit import RateLimitMiddleware, TelegramRateLimiter
+from utils.session import CachedMarkupSession
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
 logger = logging.getLogger(__name__)
 
+# Seconds a getUpdates call may hang waiting for updates; longer means fewer empty round trips.
+POLLING_TIMEOUT = 20
+# Handlers running at the same time across all users (enforced by ConcurrencyMiddleware after the per-user lock).
+MAX_CONCURRENT_UPDATES = 100
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Set up root logging once; a no-op if handlers are already installed (e.g. by a supervisor)."""
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    handler = logging.StreamHandler()
+    # Milliseconds since start instead of asctime: no datetime formatting per record,
+    # wall-clock time is stamped by the process manager (systemd/journald, docker logs).
+    handler.setFormatter(logging.Formatter("%(relativeCreated)d [%(levelname)s] %(name)s: %(message)s"))
+    root.addHandler(handler)
+    root.setLevel(level)
+    # aiogram logs every handled update at INFO; keep that off the hot path.
+    logging.getLogger("aiogram.event").setLevel(max(level, logging.WARNING))
+
+
+def create_storage(settings: Settings) -> BaseStorage:
+    """Redis-backed FSM storage when REDIS_URL is set, so states survive restarts and are shared between workers."""
+    if settings.redis_url:
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        return RedisStorage.from_url(settings.redis_url)
+    return MemoryStorage()
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher, settings: Settings) -> None:
+    """Serve updates pushed by Telegram instead of polling getUpdates."""
+    app = web.Application()
+    # Settings.validate() guarantees a secret here, so forged POSTs to the endpoint are rejected.
+    SimpleRequestHandler(dispatcher=dp, bot=bot, secret_token=settings.webhook_secret).register(
+        app, path=settings.webhook_path
+    )
+    setup_application(app, dp, bot=bot)
+
+    # Like start_polling(handle_signals=True): stop on SIGTERM/SIGINT so main() can clean up.
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows event loops
+            pass
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host=settings.webapp_host, port=settings.webapp_port).start()
+        await bot.set_webhook(
+            f"{settings.webhook_url.rstrip('/')}{settings.webhook_path}",
+            secret_token=settings.webhook_secret,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+        logger.info("Webhook server listening on %s:%s", settings.webapp_host, settings.webapp_port)
+        await stop.wait()
+        logger.info("Shutting down webhook server")
+    finally:
+        await runner.cleanup()
+
 
 async def main() -> None:
-    settings = Settings()
-    settings.validate()
+    settings = get_settings()
 
-    db = Database(settings.db_path)
+    db = Database(settings.db_path, pool_size=settings.db_pool_size)
     await db.connect()
     await db.create_schema()
 
-    bot = Bot(token=settings.bot_token, parse_mode="HTML")
-    dp = Dispatcher(storage=MemoryStorage())
+    session = CachedMarkupSession()
+    session.middleware(RateLimitMiddleware(TelegramRateLimiter()))
+    bot = Bot(token=settings.bot_token, session=session, default=DefaultBotProperties(parse_mode="HTML"))
+    dp = Dispatcher(storage=create_storage(settings))
 
     dp["db"] = db
     dp["settings"] = settings
+    dp.update.outer_middleware(ConcurrencyMiddleware(max_concurrent=MAX_CONCURRENT_UPDATES))
     register_handlers(dp)
 
+    replay_task = asyncio.create_task(replay_pending_notifications(bot, db))
     try:
-        await dp.start_polling(bot)
+        if settings.webhook_url:
+            await run_webhook(bot, dp, settings)
+        else:
+            # A webhook left over from a previous deployment would make getUpdates fail.
+            await bot.delete_webhook()
+            await dp.start_polling(
+                bot,
+                polling_timeout=POLLING_TIMEOUT,
+                allowed_updates=dp.resolve_used_update_types(),
+                handle_as_tasks=True,
+                close_bot_session=False,
+            )
     finally:
+        replay_task.cancel()
+        await asyncio.gather(replay_task, return_exceptions=True)
+        # In-flight notifications may still enqueue dead letters, so they must finish before db.close().
+        await drain_background_notifications()
+        await bot.session.close()
+        await dp.storage.close()
         await db.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    configure_logging()
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -0,0 +1,3 @@
+"""Dispatcher middlewares."""
+
+from .concurrency import ConcurrencyMiddleware  # noqa: F401
@@ -0,0 +1,46 @@
+"""Per-user serialization and a global cap on updates handled at once."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+from weakref import WeakValueDictionary
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+
+class ConcurrencyMiddleware(BaseMiddleware):
+    """Handles one update per user at a time and at most ``max_concurrent`` updates overall.
+
+    Repeated presses of the same button (e.g. "✅ Подтвердить заказ") are processed one after
+    another, so the second one sees the state left by the first instead of racing it.
+    """
+
+    def __init__(self, max_concurrent: int = 100) -> None:
+        # Locks disappear on their own once no update of that user holds them.
+        self._user_locks: "WeakValueDictionary[int, asyncio.Lock]" = WeakValueDictionary()
+        self._limit = asyncio.Semaphore(max_concurrent)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None:
+            async with self._limit:
+                return await handler(event, data)
+
+        lock = self._user_locks.get(user.id)
+        if lock is None:
+            lock = self._user_locks[user.id] = asyncio.Lock()
+        waited = lock.locked()
+        async with lock:
+            state = data.get("state")
+            if waited and state is not None:
+                # FSM state was resolved before we queued; the previous update may have changed it.
+                data["raw_state"] = await state.get_state()
+            async with self._limit:
+                return await handler(event, data)
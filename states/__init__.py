@@ -1,5 +1,30 @@
 """Finite state machines for the bot."""
 
-from .order import OrderStates  # noqa: F401
-from .admin import AdminAddProductStates, AdminEditProductStates, AdminCategoryStates  # noqa: F401
+from __future__ import annotations
 
+from importlib import import_module
+from typing import Any, List
+
+# State groups are imported from their submodule on first access (PEP 562).
+_LAZY_EXPORTS = {
+    "OrderStates": ".order",
+    "AdminAddProductStates": ".admin",
+    "AdminEditProductStates": ".admin",
+    "AdminCategoryStates": ".admin",
+}
+
+__all__ = tuple(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,19 @@
+"""FSM helpers shared by the order flow."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+
+
+async def update_and_transition(state: FSMContext, new_state: State, **data: Any) -> Dict[str, Any]:
+    """Store ``data`` and switch to ``new_state`` concurrently. Returns the updated data.
+
+    State and data live under separate storage keys, so both writes can be in flight at once
+    instead of costing two sequential storage round trips per step.
+    """
+    updated, _ = await asyncio.gather(state.update_data(**data), state.set_state(new_state))
+    return updated
@@ -0,0 +1,35 @@
+"""Helpers for updating bot messages in place."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Awaitable, Iterable, List, Optional
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InlineKeyboardMarkup, Message
+
+
+logger = logging.getLogger(__name__)
+
+
+async def edit_or_answer(message: Message, text: str, reply_markup: Optional[InlineKeyboardMarkup] = None) -> None:
+    """Edit ``message`` in place; send a new message only if it cannot be edited (e.g. a photo)."""
+    try:
+        await message.edit_text(text, reply_markup=reply_markup)
+    except TelegramBadRequest as exc:
+        if "message is not modified" in str(exc):
+            return
+        await message.answer(text, reply_markup=reply_markup)
+
+
+async def send_in_order(sends: Iterable[Awaitable[Any]]) -> List[Any]:
+    """Await sends one after another so messages arrive in order; a failed send is logged and
+    returned as its exception, not raised. Pacing is left to the session's rate limiter."""
+    results: List[Any] = []
+    for send in sends:
+        try:
+            results.append(await send)
+        except Exception as exc:
+            logger.warning("Failed to send message: %s", exc, exc_info=exc)
+            results.append(exc)
+    return results
@@ -2,14 +2,132 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+from typing import Iterable, Optional, Set
+
 from aiogram import Bot
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+from aiogram.types import InlineKeyboardMarkup, Message
+
+from ..database.db import Database
+
+
+logger = logging.getLogger(__name__)
+
+# Strong references to in-flight background sends; the event loop only keeps weak ones.
+_BACKGROUND_TASKS: Set["asyncio.Task[None]"] = set()
+
+# Rows resent per replay round; pacing itself is done by the session rate limiter.
+_REPLAY_BATCH_SIZE = 30
 
+# Failures worth retrying later; a blocked bot or a bad chat id will not fix itself.
+_TRANSIENT_ERRORS = (TelegramNetworkError, TelegramRetryAfter, TelegramServerError)
+_REPLAY_INTERVAL = 30.0
+_REPLAY_MAX_ATTEMPTS = 10
 
-async def notify_admins(bot: Bot, admin_ids: list[int], text: str, **kwargs) -> None:
-    """Send notification text to all admins."""
-    for admin_id in admin_ids:
+
+async def _on_send_failure(
+    db: Optional[Database],
+    admin_id: int,
+    text: str,
+    reply_markup: Optional[InlineKeyboardMarkup],
+    exc: BaseException,
+) -> None:
+    logger.warning("Failed to notify admin %s: %s", admin_id, exc)
+    if db is not None and isinstance(exc, _TRANSIENT_ERRORS):
+        markup_json = reply_markup.model_dump_json(exclude_none=True) if reply_markup else None
+        await db.enqueue_notification(admin_id, text, markup_json)
+
+
+async def notify_admins(
+    bot: Bot,
+    admin_ids: Iterable[int],
+    text: str,
+    db: Optional[Database] = None,
+    reply_markup: Optional[InlineKeyboardMarkup] = None,
+) -> None:
+    """Send notification text to all admins concurrently; the session rate limiter paces the sends.
+
+    The text is sent once; the other admins get a ``copyMessage`` of that message,
+    whose request carries only ids instead of the whole text. With ``db`` given,
+    sends that fail for a transient reason are queued for
+    ``replay_pending_notifications`` instead of being lost.
+    """
+    # Order-preserving dedup: a repeated id would otherwise be messaged twice.
+    admin_ids = list(dict.fromkeys(admin_ids))
+    if not admin_ids:
+        return
+    source: Optional[Message] = None
+    while admin_ids and source is None:
+        admin_id = admin_ids.pop(0)
         try:
-            await bot.send_message(admin_id, text, **kwargs)
-        except Exception:
+            source = await bot.send_message(admin_id, text, reply_markup=reply_markup)
+        except Exception as exc:
+            await _on_send_failure(db, admin_id, text, reply_markup, exc)
+
+    if source is None:
+        return
+    results = await asyncio.gather(
+        *(
+            bot.copy_message(
+                admin_id,
+                from_chat_id=source.chat.id,
+                message_id=source.message_id,
+                reply_markup=reply_markup,
+            )
+            for admin_id in admin_ids
+        ),
+        return_exceptions=True,
+    )
+    for admin_id, result in zip(admin_ids, results):
+        # BaseException: a cancelled copy comes back as CancelledError.
+        if isinstance(result, BaseException):
+            await _on_send_failure(db, admin_id, text, reply_markup, result)
+
+
+def notify_admins_in_background(
+    bot: Bot,
+    admin_ids: Iterable[int],
+    text: str,
+    db: Optional[Database] = None,
+    reply_markup: Optional[InlineKeyboardMarkup] = None,
+) -> None:
+    """Schedule ``notify_admins`` without waiting for delivery."""
+    task = asyncio.create_task(notify_admins(bot, admin_ids, text, db=db, reply_markup=reply_markup))
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+
+
+async def drain_background_notifications() -> None:
+    """Wait for notifications scheduled with ``notify_admins_in_background``; call before closing the DB."""
+    if _BACKGROUND_TASKS:
+        await asyncio.gather(*_BACKGROUND_TASKS, return_exceptions=True)
+
+
+async def _replay_batch(bot: Bot, db: Database) -> None:
+    for item in await db.get_pending_notifications(limit=_REPLAY_BATCH_SIZE):
+        markup = InlineKeyboardMarkup.model_validate_json(item.reply_markup) if item.reply_markup else None
+        try:
+            await bot.send_message(item.chat_id, item.text, reply_markup=markup)
+        except _TRANSIENT_ERRORS as exc:
+            if item.attempts + 1 >= _REPLAY_MAX_ATTEMPTS:
+                logger.error("Dropping notification %s for %s: %s", item.id, item.chat_id, exc)
+                await db.delete_notification(item.id)
+            else:
+                await db.bump_notification_attempts(item.id)
             continue
+        except Exception as exc:
+            logger.error("Dropping notification %s for %s: %s", item.id, item.chat_id, exc)
+        await db.delete_notification(item.id)
+
 
+async def replay_pending_notifications(bot: Bot, db: Database, interval: float = _REPLAY_INTERVAL) -> None:
+    """Background worker: periodically resend queued notifications until they are delivered."""
+    while True:
+        try:
+            await _replay_batch(bot, db)
+        except Exception:
+            # e.g. "database is locked"; the rows stay queued for the next round.
+            logger.exception("Replaying pending notifications failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,74 @@
+"""Outgoing Bot API rate limiting."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+
+
+logger = logging.getLogger(__name__)
+
+# Only methods that deliver messages count towards Telegram's ~30 messages/second limit.
+_LIMITED_METHOD_PREFIXES = ("send", "copy", "forward")
+
+
+class TelegramRateLimiter:
+    """In-process token bucket: ``rate`` acquisitions per ``per`` seconds, with bursts up to ``rate``."""
+
+    def __init__(self, rate: int = 30, per: float = 1.0) -> None:
+        self._capacity = float(rate)
+        self._tokens = float(rate)
+        self._fill_rate = rate / per
+        self._updated = time.monotonic()
+        # Waiters queue on the lock, so tokens are handed out in arrival order.
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._fill_rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._fill_rate)
+
+    async def __aenter__(self) -> "TelegramRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """Session middleware: paces message-sending calls and retries once after a 429."""
+
+    def __init__(self, limiter: TelegramRateLimiter) -> None:
+        self._limiter = limiter
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[Any],
+        bot: Bot,
+        method: TelegramMethod[Any],
+    ) -> Response[Any]:
+        limited = method.__api_method__.startswith(_LIMITED_METHOD_PREFIXES)
+        if limited:
+            await self._limiter.acquire()
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter as exc:
+            logger.warning("Flood control on %s, retrying in %s s", method.__api_method__, exc.retry_after)
+            await asyncio.sleep(exc.retry_after)
+            if limited:
+                await self._limiter.acquire()
+            return await make_request(bot, method)
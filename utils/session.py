@@ -0,0 +1,57 @@
+"""Bot API session: orjson (when installed) and pre-rendered JSON for static keyboards."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, TypeVar
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.methods import TelegramMethod
+from aiohttp import FormData
+
+try:  # C JSON codec; the stdlib json module is used when it is missing
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_MarkupT = TypeVar("_MarkupT")
+
+# Markups registered here live for the whole process, so their ids stay unique.
+_FROZEN_MARKUPS: Dict[int, Any] = {}
+
+
+def _orjson_dumps(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+
+def freeze_markup(markup: _MarkupT) -> _MarkupT:
+    """Mark a module-level keyboard as immutable so its JSON is rendered only once."""
+    _FROZEN_MARKUPS[id(markup)] = markup
+    return markup
+
+
+class CachedMarkupSession(AiohttpSession):
+    """Aiohttp session that parses and encodes with orjson and serializes each frozen
+    ``reply_markup`` a single time."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        if orjson is not None:
+            kwargs.setdefault("json_loads", orjson.loads)
+            kwargs.setdefault("json_dumps", _orjson_dumps)
+        super().__init__(**kwargs)
+        self._markup_json: Dict[int, str] = {}
+
+    def build_form_data(self, bot: Bot, method: TelegramMethod[Any]) -> FormData:
+        markup = getattr(method, "reply_markup", None)
+        if markup is None or id(markup) not in _FROZEN_MARKUPS:
+            return super().build_form_data(bot, method)
+
+        rendered = self._markup_json.get(id(markup))
+        if rendered is None:
+            rendered = self.prepare_value(markup, bot=bot, files={})
+            self._markup_json[id(markup)] = rendered
+
+        form = super().build_form_data(bot, method.model_copy(update={"reply_markup": None}))
+        form.add_field("reply_markup", rendered)
+        return form